@@ -0,0 +1,84 @@
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------------- Regex for WhatsApp Chat ----------------
+line_pattern = re.compile(r'^(\d{1,2}/\d{1,2}/\d{4}), (\d{2}:\d{2}) - (.+?): (.*)$')
+
+def parse_chat(file_bytes):
+    """Convert WhatsApp txt export to DataFrame"""
+    text = file_bytes.decode("utf-8", errors="replace")
+    matches = map(line_pattern.match, map(str.strip, text.split("\n")))
+    rows = [match.groups() for match in matches if match]
+    del text  # Free the decoded copy before building the frame
+    df = pd.DataFrame(rows, columns=["Date", "Time", "Name", "Message"])
+    df['Name'] = df['Name'].str.extract(r'^\s*([^(]*?)\s*(?:\(|$)', expand=False).astype('category')  # Clean names
+    df['Message'] = df['Message'].astype("string[pyarrow]")  # Arrow kernels for keyword search
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)  # Bounded: shared by all sessions
+def load_df(file_bytes):
+    """Parse the export and derive the datetime columns, cached per file; also counts undated rows"""
+    df = parse_chat(file_bytes)
+
+    # Convert Date + Time into datetime
+    df['DateTime'] = pd.to_datetime(df['Date'] + " " + df['Time'], dayfirst=True, errors='coerce')
+    unparsed = int(df['DateTime'].isna().sum())
+    df.dropna(subset=['DateTime'], inplace=True)
+    df['Date'] = df['DateTime'].dt.date
+    df['Time'] = df['DateTime'].dt.time
+    # Truncate the tz-naive datetime64 values in numpy rather than via .dt
+    timestamps = df['DateTime'].to_numpy()
+    df['HourRound'] = (timestamps.astype('datetime64[h]').astype('int64') % 24).astype('int8')
+    df['MinuteRound'] = timestamps.astype('datetime64[m]').astype('datetime64[ns]')
+    df['_msg_lower'] = df['Message'].str.lower()  # For keyword search
+    return df, unparsed
+
+# ---------------- Filters ----------------
+def apply_filters(df, names, date=None, keyword=""):
+    """Select messages by participant, date and keyword with a single mask"""
+    mask = df['Name'].isin(names)
+    if date:
+        mask &= df['Date'] == date
+    if keyword:
+        # Same lowercase kernel as _msg_lower (Arrow and str.lower differ on 'İ', 'Σ')
+        needle = pd.Series([keyword], dtype=df['_msg_lower'].dtype).str.lower().iat[0]
+        mask &= df['_msg_lower'].str.contains(needle, na=False, regex=False)
+    return df.loc[mask]
+
+# ---------------- Aggregations ----------------
+def duration_summary(df, max_idle_minutes=15):
+    """Messages sent and active chat time per participant"""
+    sorted_df = df[['Name', 'DateTime']].sort_values('DateTime')
+    grouped = sorted_df.groupby('Name', sort=False, observed=True)['DateTime']
+    deltas = grouped.diff()
+    active = deltas.where(deltas <= pd.Timedelta(minutes=max_idle_minutes), pd.Timedelta(0))
+    active_time = active.groupby(sorted_df['Name'], sort=False, observed=True).sum()
+
+    active_minutes = (active_time.dt.total_seconds() // 60).astype(int)
+    return pd.DataFrame({
+        'Messages Sent': grouped.size(),
+        'Active Chat Duration': (active_minutes // 60).astype(str) + "h " + (active_minutes % 60).astype(str) + "m"
+    }).rename_axis('Participant').reset_index()
+
+def hourly_counts(df):
+    """Message count per hour of day and participant"""
+    # 24 x participants histogram over the category codes, no groupby needed
+    names = df['Name'].cat.categories
+    keys = df['HourRound'].to_numpy().astype(np.intp) * len(names) + df['Name'].cat.codes.to_numpy()
+    grid = np.bincount(keys, minlength=24 * len(names)).reshape(24, len(names))
+    hours, codes = np.nonzero(grid)
+    return pd.DataFrame({
+        'HourRound': hours.astype('int8'),
+        'Name': pd.Categorical.from_codes(codes, categories=names),
+        'MessageCount': grid[hours, codes].astype('int32')
+    })
+
+def minute_counts(df):
+    """Message count per minute and participant"""
+    grouped = df[['MinuteRound', 'Name']].groupby(['MinuteRound', 'Name'], sort=False, observed=True, as_index=False)
+    counts = grouped.size().rename(columns={'size': 'MessageCount'})
+    counts['MessageCount'] = counts['MessageCount'].astype('int32')
+    return counts
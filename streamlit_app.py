@@ -1,8 +1,8 @@
-import re
-import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+import chat_pipeline as pipeline
+
 # ---------------- Page Config ----------------
 st.set_page_config(
     page_title="WhatsApp Chat Analysis Dashboard | Dinesh S. Kumawat | cln35h | 学習者",
@@ -33,43 +33,15 @@ Use of this project is at your own risk. The author assumes **no liability** for
 st.markdown("---")
 
 
-# ---------------- Regex for WhatsApp Chat ----------------
-line_pattern = re.compile(r'(\d{1,2}/\d{1,2}/\d{4}), (\d{2}:\d{2}) - (.+?): (.*)')
-
-def parse_line(line):
-    """Parse a single line of WhatsApp chat"""
-    match = line_pattern.match(line)
-    if match:
-        date, time, name, message = match.groups()
-        name = name.split('(')[0].strip()  # Clean names
-        return [date, time, name, message]
-    return None
-
-def parse_chat(file):
-    """Convert WhatsApp txt export to DataFrame"""
-    data = []
-    for raw_line in file:
-        line = raw_line.decode("utf-8").strip()
-        parsed = parse_line(line)
-        if parsed:
-            data.append(parsed)
-    df = pd.DataFrame(data, columns=["Date", "Time", "Name", "Message"])
-    return df
-
 # ---------------- Sidebar ----------------
 st.sidebar.header("Upload WhatsApp Chat File")
 uploaded_file = st.sidebar.file_uploader("Upload WhatsApp .txt", type=["txt"])
 
 if uploaded_file:
     # Parse txt → DataFrame
-    df = parse_chat(uploaded_file)
-
-    # Convert Date + Time into datetime
-    df['DateTime'] = pd.to_datetime(df['Date'] + " " + df['Time'], dayfirst=True, errors='coerce')
-    df['Date'] = df['DateTime'].dt.date
-    df['Time'] = df['DateTime'].dt.time
-    df['HourRound'] = df['DateTime'].dt.hour
-    df['MinuteRound'] = df['DateTime'].dt.floor('T')
+    df, unparsed = pipeline.load_df(uploaded_file.getvalue())
+    if unparsed:
+        st.warning(f"Skipped {unparsed} message(s) whose date could not be read.")
 
     # ---------------- Sidebar Filters ----------------
     participants = df['Name'].unique().tolist()
@@ -82,11 +54,7 @@ if uploaded_file:
     keyword = st.sidebar.text_input("Search Messages (keyword)")
 
     # ---------------- Apply Filters ----------------
-    filtered_df = df[df['Name'].isin(selected_participant)]
-    if selected_date:
-        filtered_df = filtered_df[filtered_df['Date'] == selected_date]
-    if keyword:
-        filtered_df = filtered_df[filtered_df['Message'].str.contains(keyword, case=False, na=False)]
+    filtered_df = pipeline.apply_filters(df, selected_participant, selected_date, keyword)
     
     # ---------------- Show Raw Data ----------------
     st.subheader("Filtered Messages")
@@ -94,33 +62,16 @@ if uploaded_file:
 
     # ---------------- Chat Duration Summary ----------------
     st.subheader("Chat Duration Summary")
-    duration_summary = []
-    max_idle_minutes = 15  
-
-    for participant in selected_participant:
-        person_df = filtered_df[filtered_df['Name'] == participant].sort_values('DateTime')
-        if not person_df.empty:
-            total_duration = person_df['DateTime'].max() - person_df['DateTime'].min()
-            total_hours, total_remainder = divmod(total_duration.total_seconds(), 3600)
-            total_minutes, _ = divmod(total_remainder, 60)
-
-            deltas = person_df['DateTime'].diff().fillna(pd.Timedelta(seconds=0))
-            active_time = deltas[deltas <= pd.Timedelta(minutes=max_idle_minutes)].sum()
-            active_hours, active_remainder = divmod(active_time.total_seconds(), 3600)
-            active_minutes, _ = divmod(active_remainder, 60)
-
-            duration_summary.append({
-                'Participant': participant,
-                'Messages Sent': person_df.shape[0],
-                'Active Chat Duration': f"{int(active_hours)}h {int(active_minutes)}m"
-            })
+    duration_summary = pipeline.duration_summary(filtered_df, max_idle_minutes=15)
+    st.dataframe(duration_summary)
 
-    st.dataframe(pd.DataFrame(duration_summary))
+    # Same participant order (and so colours) in every chart
+    name_order = df['Name'].cat.categories.tolist()
 
     # ---------------- Messages per Hour ----------------
     st.subheader("Messages per Hour per Participant")
     if not filtered_df.empty:
-        hourly_counts = filtered_df.groupby(['HourRound', 'Name']).size().reset_index(name='MessageCount')
+        hourly_counts = pipeline.hourly_counts(filtered_df)
         fig_hourly = px.bar(
             hourly_counts,
             x="HourRound",
@@ -128,14 +79,15 @@ if uploaded_file:
             color="Name",
             barmode="stack",
             title="Messages per Hour per Participant",
-            labels={"HourRound": "Hour of Day", "MessageCount": "Number of Messages"}
+            labels={"HourRound": "Hour of Day", "MessageCount": "Number of Messages"},
+            category_orders={"Name": name_order}
         )
         st.plotly_chart(fig_hourly, use_container_width=True)
 
     # ---------------- Messages per Minute ----------------
     st.subheader("Messages per Minute per Participant")
     if not filtered_df.empty:
-        minute_counts = filtered_df.groupby(['MinuteRound', 'Name']).size().reset_index(name='MessageCount')
+        minute_counts = pipeline.minute_counts(filtered_df)
         fig_minute = px.bar(
             minute_counts,
             x="MinuteRound",
@@ -143,7 +95,8 @@ if uploaded_file:
             color="Name",
             barmode="stack",
             title="Messages per Minute per Participant",
-            labels={"MinuteRound": "Time (Minute)", "MessageCount": "Number of Messages"}
+            labels={"MinuteRound": "Time (Minute)", "MessageCount": "Number of Messages"},
+            category_orders={"Name": name_order}
         )
         st.plotly_chart(fig_minute, use_container_width=True)
 